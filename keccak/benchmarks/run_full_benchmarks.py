@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
+from run_benchmarks import bench_eth_hash, bench_pycryptodome, pin_to_single_core
 
 Result = Dict[str, float | str | int | None]
 
@@ -57,6 +60,14 @@ def _load_json(output: str) -> Result | List[Result]:
         raise SystemExit(f"Failed to parse JSON output: {output}") from exc
 
 
+def _is_up_to_date(target: Path, sources: Iterable[Path]) -> bool:
+    """Return True when ``target`` exists and is newer than every source."""
+    if not target.exists():
+        return False
+    target_mtime = target.stat().st_mtime
+    return all(src.stat().st_mtime <= target_mtime for src in sources)
+
+
 def _ensure_tool(executable: str, message: str) -> str:
     tool = shutil.which(executable)
     if tool is None:
@@ -71,21 +82,15 @@ def _ensure_mojo() -> str:
     )
 
 
-def _collect_python_results(root: Path, args: argparse.Namespace) -> List[Result]:
-    cmd = [
-        sys.executable,
-        str(root / "benchmarks" / "run_benchmarks.py"),
-        "--json",
-    ]
-    if args.skip_eth_hash:
-        cmd.append("--skip-eth-hash")
-    if args.skip_pycryptodome:
-        cmd.append("--skip-pycryptodome")
-    output = _run_checked(cmd, cwd=root)
-    data = _load_json(output)
-    if isinstance(data, dict):
-        return [data]
-    return list(data)
+def _collect_python_results(args: argparse.Namespace) -> List[Result]:
+    # The Python baselines run in-process: no interpreter start-up or JSON
+    # round trip per invocation.
+    results: List[Result] = []
+    if not args.skip_eth_hash:
+        results.append(bench_eth_hash())
+    if not args.skip_pycryptodome:
+        results.append(bench_pycryptodome())
+    return results
 
 
 def _collect_mojo_jit(root: Path, mojo: str, args: argparse.Namespace) -> Result:
@@ -105,22 +110,33 @@ def _collect_mojo_jit(root: Path, mojo: str, args: argparse.Namespace) -> Result
     return data
 
 
-def _collect_mojo_compiled(
-    root: Path, mojo: str, args: argparse.Namespace
-) -> Result:
+def _build_mojo_compiled(root: Path, mojo: str, args: argparse.Namespace) -> Path:
     build_dir = root / args.build_dir
     build_dir.mkdir(parents=True, exist_ok=True)
     binary = build_dir / args.binary_name
-    build_cmd = [
-        mojo,
-        "build",
-        "-I",
-        str(root),
-        str(root / "benchmarks" / "mojo_benchmark.mojo"),
-        "-o",
-        str(binary),
+    # The benchmark is built with ``-I root`` and only pulls in the keccak
+    # package, its own directory and the top-level modules. Globbing just those
+    # keeps the scan out of ``.pixi`` envs and the Rust ``target`` tree.
+    sources = [
+        *root.glob("*.mojo"),
+        *(root / "keccak").rglob("*.mojo"),
+        *(root / "benchmarks").glob("*.mojo"),
     ]
-    _run_checked(build_cmd, cwd=root)
+    if args.force_rebuild or not _is_up_to_date(binary, sources):
+        build_cmd = [
+            mojo,
+            "build",
+            "-I",
+            str(root),
+            str(root / "benchmarks" / "mojo_benchmark.mojo"),
+            "-o",
+            str(binary),
+        ]
+        _run_checked(build_cmd, cwd=root)
+    return binary
+
+
+def _run_mojo_compiled(root: Path, binary: Path, args: argparse.Namespace) -> Result:
     run_cmd = [
         str(binary),
         "--label",
@@ -134,7 +150,83 @@ def _collect_mojo_compiled(
     return data
 
 
-def _collect_c_baseline(root: Path, args: argparse.Namespace) -> Result:
+def _c_build_cmd(
+    compiler: str, sources: List[Path], output: Path, extra: List[str]
+) -> List[str]:
+    return [
+        compiler,
+        "-O3",
+        "-std=c11",
+        "-Wall",
+        "-Wextra",
+        "-Werror",
+        "-march=native",
+        "-flto",
+        *extra,
+        *(str(src) for src in sources),
+        "-o",
+        str(output),
+    ]
+
+
+def _train_c_profile(
+    root: Path,
+    compiler: str,
+    sources: List[Path],
+    dependencies: List[Path],
+    binary: Path,
+    args: argparse.Namespace,
+) -> List[str]:
+    """Collect a PGO profile for the C baseline and return the flags using it.
+
+    The profile is cached in the build directory, keyed on the binary name and
+    the compiler (GCC names its profile files after the output, and neither
+    compiler reads the other's or an older version's profiles). It is
+    regenerated when the C sources change or ``--force-rebuild`` is given.
+    Returns no flags when the toolchain cannot do PGO (clang without
+    ``llvm-profdata``).
+    """
+    version = _run_checked([compiler, "--version"])
+    is_clang = "clang" in version.lower()
+    compiler_id = "{}-{}".format(
+        "clang" if is_clang else "gcc",
+        hashlib.sha1(version.encode()).hexdigest()[:8],
+    )
+    build_dir = root / args.build_dir
+    profile_dir = build_dir / "c-pgo" / f"{args.c_binary_name}-{compiler_id}"
+    stamp = profile_dir / "trained"
+    if is_clang:
+        profdata_tool = shutil.which("llvm-profdata")
+        if profdata_tool is None:
+            return []
+        profdata = profile_dir / "default.profdata"
+        use_flags = [f"-fprofile-use={profdata}"]
+    else:
+        # A translation unit without profile data falls back to a plain
+        # optimised build instead of failing under -Werror.
+        use_flags = [f"-fprofile-use={profile_dir}", "-Wno-missing-profile"]
+    if not args.force_rebuild and _is_up_to_date(stamp, dependencies):
+        return use_flags
+
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    profile_dir.mkdir(parents=True)
+    # GCC names profile files after the output, so the instrumented binary is
+    # written to the same path the optimised build will later overwrite.
+    gen_cmd = _c_build_cmd(
+        compiler, sources, binary, [f"-fprofile-generate={profile_dir}"]
+    )
+    _run_checked(gen_cmd, cwd=root)
+    _run_checked([str(binary), "--label", "pgo-training", "--json"], cwd=root)
+    if is_clang:
+        raw_profiles = [str(path) for path in profile_dir.glob("*.profraw")]
+        _run_checked(
+            [profdata_tool, "merge", f"-output={profdata}", *raw_profiles], cwd=root
+        )
+    stamp.touch()
+    return use_flags
+
+
+def _build_c_baseline(root: Path, args: argparse.Namespace) -> Path:
     compiler = _ensure_tool(
         "cc",
         "Unable to locate a C compiler (`cc`). Install one (e.g. clang or gcc) before running the C baseline.",
@@ -146,18 +238,28 @@ def _collect_c_baseline(root: Path, args: argparse.Namespace) -> Result:
         root / "benchmarks" / "c" / "keccak256.c",
         root / "benchmarks" / "c" / "bench_keccak256.c",
     ]
-    build_cmd = [
-        compiler,
-        "-O3",
-        "-std=c11",
-        "-Wall",
-        "-Wextra",
-        "-Werror",
-        *(str(src) for src in sources),
-        "-o",
-        str(binary),
-    ]
-    _run_checked(build_cmd, cwd=root)
+    dependencies = [*sources, root / "benchmarks" / "c" / "keccak256.h"]
+    # PGO training writes an instrumented build to ``binary`` itself, so the
+    # binary only counts as current once this stamp records a finished build.
+    built = build_dir / f"{args.c_binary_name}.built"
+    if (
+        args.force_rebuild
+        or not binary.exists()
+        or not _is_up_to_date(built, dependencies)
+    ):
+        built.unlink(missing_ok=True)
+        # Two-phase PGO build: an instrumented binary runs the benchmark once,
+        # then the final -flto -march=native build is optimised with that profile.
+        profile_flags = _train_c_profile(
+            root, compiler, sources, dependencies, binary, args
+        )
+        build_cmd = _c_build_cmd(compiler, sources, binary, profile_flags)
+        _run_checked(build_cmd, cwd=root)
+        built.touch()
+    return binary
+
+
+def _run_c_baseline(root: Path, binary: Path, args: argparse.Namespace) -> Result:
     run_cmd = [
         str(binary),
         "--label",
@@ -171,19 +273,38 @@ def _collect_c_baseline(root: Path, args: argparse.Namespace) -> Result:
     return data
 
 
-def _collect_rust_baseline(root: Path, args: argparse.Namespace) -> Result:
+def _build_rust_baseline(root: Path, args: argparse.Namespace) -> Path:
     _ensure_tool(
         "cargo",
         "Unable to locate `cargo`. Install Rust (https://rustup.rs/) before running the Rust baseline.",
     )
+    crate = root / "benchmarks" / "rust"
     cmd = [
         "cargo",
-        "run",
+        "build",
         "--quiet",
         "--release",
         "--bin",
         "bench",
-        "--",
+        "--message-format=json-render-diagnostics",
+    ]
+    output = _run_checked(cmd, cwd=crate)
+    # Ask cargo where it put the binary so CARGO_TARGET_DIR and
+    # build.target-dir are honoured.
+    for line in output.splitlines():
+        message = json.loads(line)
+        if (
+            message.get("reason") == "compiler-artifact"
+            and message["target"]["name"] == "bench"
+            and message.get("executable")
+        ):
+            return Path(message["executable"])
+    raise SystemExit("cargo build did not report the Rust benchmark executable.")
+
+
+def _run_rust_baseline(root: Path, binary: Path, args: argparse.Namespace) -> Result:
+    cmd = [
+        str(binary),
         "--label",
         args.rust_label,
         "--json",
@@ -237,6 +358,11 @@ def main(argv: List[str] | None = None) -> int:
         default=".bench-build",
         help="Directory for compiled Mojo artifacts (default: .bench-build).",
     )
+    parser.add_argument(
+        "--force-rebuild",
+        action="store_true",
+        help="Rebuild the Mojo and C benchmark binaries even if they are up to date.",
+    )
     parser.add_argument(
         "--binary-name",
         default="mojo_keccak_bench",
@@ -272,21 +398,42 @@ def main(argv: List[str] | None = None) -> int:
     root = Path(__file__).resolve().parents[1]
     results: List[Result] = []
 
+    mojo = None
+    if not args.skip_mojo_jit or not args.skip_mojo_compiled:
+        mojo = _ensure_mojo()
+
+    # Builds are independent and mostly wait on compiler subprocesses, so they
+    # run concurrently. The timed runs below stay strictly sequential.
+    with ThreadPoolExecutor() as executor:
+        c_build = None if args.skip_c else executor.submit(
+            _build_c_baseline, root, args
+        )
+        rust_build = None if args.skip_rust else executor.submit(
+            _build_rust_baseline, root, args
+        )
+        mojo_build = None if args.skip_mojo_compiled else executor.submit(
+            _build_mojo_compiled, root, mojo, args
+        )
+        c_binary = None if c_build is None else c_build.result()
+        rust_binary = None if rust_build is None else rust_build.result()
+        mojo_binary = None if mojo_build is None else mojo_build.result()
+
+    pin_to_single_core()
+
     if not (args.skip_eth_hash and args.skip_pycryptodome):
-        results.extend(_collect_python_results(root, args))
+        results.extend(_collect_python_results(args))
 
-    if not args.skip_c:
-        results.append(_collect_c_baseline(root, args))
+    if c_binary is not None:
+        results.append(_run_c_baseline(root, c_binary, args))
 
-    if not args.skip_rust:
-        results.append(_collect_rust_baseline(root, args))
+    if rust_binary is not None:
+        results.append(_run_rust_baseline(root, rust_binary, args))
 
-    if not args.skip_mojo_jit or not args.skip_mojo_compiled:
-        mojo = _ensure_mojo()
+    if mojo is not None:
         if not args.skip_mojo_jit:
             results.append(_collect_mojo_jit(root, mojo, args))
-        if not args.skip_mojo_compiled:
-            results.append(_collect_mojo_compiled(root, mojo, args))
+        if mojo_binary is not None:
+            results.append(_run_mojo_compiled(root, mojo_binary, args))
 
     if args.json:
         print(json.dumps(results, indent=2))
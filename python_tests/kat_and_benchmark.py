@@ -5,10 +5,11 @@ import os
 import time
 
 try:
+    import coincurve
     from eth_keys import keys
     from eth_utils.crypto import keccak
 except ImportError:
-    print("Please install the eth-keys library: pip install eth-keys")
+    print("Please install the eth-keys and coincurve libraries: pip install eth-keys coincurve")
     exit(1)
 
 PRIVATE_KEY_HEX = "c9afa9d845ba75166b5c215767b1d6934e50c3db36e89b127b8a622b120f6721"
@@ -36,23 +37,40 @@ def generate_kat_vector():
         "v": signature.v,
     }
 
-def benchmark_signing(iterations=1000):
-    """Benchmarks the ECDSA signing process."""
-    private_key = keys.PrivateKey(os.urandom(32))
+def _time_signing(sign, message_hash, iterations, repeats):
+    # Best of ``repeats`` runs: the minimum is the least noisy estimate of
+    # the achievable throughput.
+    best = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            sign(message_hash)
+        end_time = time.perf_counter()
+        best = min(best, end_time - start_time)
+    return best
+
+def benchmark_signing(iterations=1000, repeats=3):
+    """Benchmarks the ECDSA signing process via eth-keys and coincurve."""
+    private_key_bytes = os.urandom(32)
     message_hash = keccak(b"benchmark message")
-    
-    start_time = time.time()
-    for _ in range(iterations):
-        private_key.sign_msg_hash(message_hash)
-    end_time = time.time()
-    
-    total_time = end_time - start_time
-    signs_per_second = iterations / total_time
-    
+
+    # eth-keys adds Python-level validation and dispatch on every call.
+    private_key = keys.PrivateKey(private_key_bytes)
+    total_time = _time_signing(private_key.sign_msg_hash, message_hash, iterations, repeats)
+
+    # coincurve calls straight into libsecp256k1; the key (and its context) is
+    # built once outside the timed loop.
+    native_key = coincurve.PrivateKey(private_key_bytes)
+    native_total_time = _time_signing(
+        lambda h: native_key.sign_recoverable(h, hasher=None), message_hash, iterations, repeats
+    )
+
     return {
         "iterations": iterations,
         "total_time": total_time,
-        "signs_per_second": signs_per_second,
+        "signs_per_second": iterations / total_time,
+        "coincurve_total_time": native_total_time,
+        "coincurve_signs_per_second": iterations / native_total_time,
     }
 
 if __name__ == "__main__":
@@ -67,9 +85,14 @@ if __name__ == "__main__":
     print(f"Recovery id (v): {kat_vector['v']}")
 
 
-    # Run and print benchmark results
+    # Run and print benchmark results, pinned to one core (Linux only) so the
+    # scheduler does not migrate the process mid-run
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
     print("\n--- ECDSA Signing Benchmark ---")
     benchmark_results = benchmark_signing()
     print(f"Iterations: {benchmark_results['iterations']}")
-    print(f"Total Time: {benchmark_results['total_time']:.4f} seconds")
-    print(f"Signatures per second: {benchmark_results['signs_per_second']:.2f}")
+    print(f"eth-keys Total Time: {benchmark_results['total_time']:.4f} seconds")
+    print(f"eth-keys Signatures per second: {benchmark_results['signs_per_second']:.2f}")
+    print(f"coincurve Total Time: {benchmark_results['coincurve_total_time']:.4f} seconds")
+    print(f"coincurve Signatures per second: {benchmark_results['coincurve_signs_per_second']:.2f}")
@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
-import sys, csv, io, binascii
-from eth_keys.datatypes import Signature
-from eth_keys import keys
+import sys, csv
+from coincurve import PublicKey
 
 def h2b(h: str) -> bytes:
-    h = h[2:] if h.startswith(("0x","0X")) else h
-    return binascii.unhexlify(h.encode())
+    return bytes.fromhex(h[2:] if h[:2] in ("0x", "0X") else h)
 
 def v_to_01(v: int) -> int:
-    # Mojo emits {27..30}; eth-keys wants 0/1 parity here
-    return (v - 27) & 1 if v >= 27 else (v & 1)
+    # Mojo emits {27..30}; libsecp256k1 wants 0/1 parity here
+    # (v - 27) & 1 flips the low bit because 27 is odd, so xor it instead
+    return (v ^ (v >= 27)) & 1
 
 def main():
-    data = sys.stdin.read()
-    rdr = csv.DictReader(io.StringIO(data), delimiter="\t")
+    # Stream rows straight from the Mojo pipe instead of buffering all of stdin
+    rdr = csv.DictReader(sys.stdin, delimiter="\t")
     fails, total = [], 0
     for row in rdr:
         total += 1
@@ -21,10 +20,11 @@ def main():
         r = int(row["r_hex"], 16)
         s = int(row["s_hex"], 16)
         v01 = v_to_01(int(row["v"]))
-        sig = Signature(vrs=(v01, r, s))
+        # One libsecp256k1 call on the 65-byte r||s||v recoverable signature
+        sig = r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v01])
 
-        rec_pub = sig.recover_public_key_from_msg_hash(msg32)
-        rec_hex = rec_pub.to_bytes().hex()     # 64 bytes (x||y)
+        rec_pub = PublicKey.from_signature_and_message(sig, msg32, hasher=None)
+        rec_hex = rec_pub.format(compressed=False)[1:].hex()     # 64 bytes (x||y)
         mojo_pub_hex = row["pub_xy_hex"].lower()
 
         ok = (rec_hex == mojo_pub_hex)
@@ -11,6 +11,7 @@ MOJO_TESTS = [
     "tests/test_ecdsa_recover.mojo",
     "tests/test_field_ops.mojo",
     "tests/test_edge_cases.mojo",
+    "tests/test_field_limb.mojo",
 ]
 
 # Cross-verification with Python/eth-keys
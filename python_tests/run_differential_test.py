@@ -4,11 +4,11 @@ import sys
 import csv
 import io
 import subprocess
-import binascii
 import tempfile
+from multiprocessing import Pool
+from coincurve.ecdsa import cdata_to_der, deserialize_compact
 from coincurve.keys import PrivateKey, PublicKey
 from eth_hash.auto import keccak
-from ecdsa.util import sigencode_der
 
 def run_mojo_signer(keys_and_messages):
     """
@@ -45,55 +45,63 @@ def run_mojo_signer(keys_and_messages):
 
     return stdout.decode()
 
+NUM_TESTS = 10000
+
+def _verify_row(row):
+    """
+    Checks one Mojo signature with coincurve.
+    Returns an error message, or None if the row passed.
+    """
+    sk_hex = row["sk_hex"]
+    msg_hex = row["msg_hex"]
+    r_hex = row["r_hex"]
+    s_hex = row["s_hex"]
+    v = int(row["v"])
+
+    sk = bytes.fromhex(sk_hex)
+    msg = bytes.fromhex(msg_hex)
+    msg_hash = keccak(msg)
+
+    priv = PrivateKey(sk)
+    pub = priv.public_key
+
+    # Verify the signature; libsecp256k1 does the compact -> DER step
+    compact_sig = bytes.fromhex(r_hex + s_hex)
+    signature = cdata_to_der(deserialize_compact(compact_sig))
+    if not pub.verify(signature, msg_hash, hasher=None):
+        return f"Signature verification failed for sk: {sk_hex}"
+
+    # Recover the public key
+    rec_id = v - 27
+    rec_sig = compact_sig + bytes([rec_id])
+    rec_pub = PublicKey.from_signature_and_message(rec_sig, msg_hash, hasher=None)
+
+    if pub.format(compressed=False) != rec_pub.format(compressed=False):
+        return f"Public key recovery failed for sk: {sk_hex}"
+    return None
+
 def main():
-    # Generate 10000 random keys and messages
-    keys_and_messages = []
-    for _ in range(10000):
-        sk = os.urandom(32)
-        msg = os.urandom(32)
-        keys_and_messages.append((sk, msg))
+    # Generate random keys and messages from a single urandom call
+    entropy = os.urandom(NUM_TESTS * 64)
+    keys_and_messages = [
+        (entropy[i:i + 32], entropy[i + 32:i + 64])
+        for i in range(0, len(entropy), 64)
+    ]
 
     # Run the Mojo signer
     mojo_output = run_mojo_signer(keys_and_messages)
 
-    # Process the output from the Mojo script
+    # Process the output from the Mojo script; rows are independent, so
+    # verify them across all cores
     reader = csv.DictReader(io.StringIO(mojo_output), delimiter='\t')
+    rows = [row for row in reader if row and row.get("v") is not None]
+    total = len(rows)
     fails = 0
-    total = 0
-    for row in reader:
-        if not row or row.get("v") is None:
-            continue
-        total += 1
-        sk_hex = row["sk_hex"]
-        msg_hex = row["msg_hex"]
-        r_hex = row["r_hex"]
-        s_hex = row["s_hex"]
-        v = int(row["v"])
-
-        sk = binascii.unhexlify(sk_hex)
-        msg = binascii.unhexlify(msg_hex)
-        msg_hash = keccak(msg)
-
-        priv = PrivateKey(sk)
-        pub = priv.public_key
-
-        # Verify the signature
-        r = int(r_hex, 16)
-        s = int(s_hex, 16)
-        signature = sigencode_der(r, s, 32 * 8)
-        if not pub.verify(signature, msg_hash, hasher=None):
-            print(f"Signature verification failed for sk: {sk_hex}", file=sys.stderr)
-            fails += 1
-            continue
-
-        # Recover the public key
-        rec_id = v - 27
-        rec_sig = binascii.unhexlify(r_hex + s_hex) + bytes([rec_id])
-        rec_pub = PublicKey.from_signature_and_message(rec_sig, msg_hash, hasher=None)
-
-        if pub.format(compressed=False) != rec_pub.format(compressed=False):
-            print(f"Public key recovery failed for sk: {sk_hex}", file=sys.stderr)
-            fails += 1
+    with Pool() as pool:
+        for error in pool.imap_unordered(_verify_row, rows, chunksize=256):
+            if error is not None:
+                print(error, file=sys.stderr)
+                fails += 1
 
     if fails > 0:
         print(f"FAIL: {fails} of {total} tests failed.", file=sys.stderr)
@@ -1,43 +1,155 @@
 #!/usr/bin/env python3
-import json
+import functools
+import ijson
 import os
 import sys
 import subprocess
 import binascii
-import csv
-import tempfile
-from ecdsa import SECP256k1
-from ecdsa.util import sigdecode_der
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def run_mojo_verifier_batch(batch):
+# Exec mojo directly rather than through a shell
+MOJO_VERIFY_CMD = [
+    "mojo", "-I", ".", "-I", "decimojo/src", "-I", "keccak",
+    "tests/test_wycheproof_verify.mojo",
+]
+
+# (expected, actual) pairs that count as a pass. "acceptable" vectors may
+# go either way, per Wycheproof.
+ALLOWED = frozenset({
+    ("valid", "valid"),
+    ("invalid", "invalid"),
+    ("acceptable", "valid"),
+    ("acceptable", "invalid"),
+})
+
+def _der_length(sig, off):
+    """
+    Decodes a DER length at `off`, returning (length, offset past it), or
+    None unless it is the short form or a minimal 0x81 long form.
+    """
+    if off >= len(sig):
+        return None
+    if sig[off] < 0x80:
+        return sig[off], off + 1
+    if sig[off] == 0x81 and off + 1 < len(sig) and sig[off + 1] >= 0x80:
+        return sig[off + 1], off + 2
+    return None
+
+def _der_integer(sig, off):
+    """
+    Decodes a non-negative, minimally encoded DER INTEGER at `off`,
+    returning (value, offset past it), or None.
     """
-    Runs the Mojo verification script for a batch of tests and returns the output.
+    if off >= len(sig) or sig[off] != 0x02:
+        return None
+    decoded = _der_length(sig, off + 1)
+    if decoded is None:
+        return None
+    length, off = decoded
+    end = off + length
+    if length == 0 or end > len(sig) or sig[off] & 0x80:
+        return None
+    if length > 1 and sig[off] == 0 and not sig[off + 1] & 0x80:
+        return None
+    return int.from_bytes(sig[off:end], "big"), end
+
+@functools.lru_cache(maxsize=8192)
+def _parse_der(sig):
+    """
+    Extracts (r, s) from a strict DER ECDSA signature, or (0, 0) if it is
+    malformed in any way. Cached by the raw bytes, since many vectors
+    reuse the same signature under a different message or key.
     """
+    if len(sig) < 2 or sig[0] != 0x30:
+        return 0, 0
+    decoded = _der_length(sig, 1)
+    if decoded is None or decoded[0] + decoded[1] != len(sig):
+        return 0, 0
+    r_part = _der_integer(sig, decoded[1])
+    if r_part is None:
+        return 0, 0
+    s_part = _der_integer(sig, r_part[1])
+    if s_part is None or s_part[1] != len(sig):
+        return 0, 0
+    return r_part[0], s_part[0]
+
+def _feed(stream, payload):
+    try:
+        stream.write(payload)
+        stream.close()
+    except BrokenPipeError:
+        pass # The verifier exited early; its status is reported by the reader
 
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-        writer = csv.writer(temp_file, delimiter='\t')
-        for pub_key, msg, r, s in batch:
-            writer.writerow([pub_key.hex(), msg.hex(), hex(r)[2:], hex(s)[2:]])
-        temp_file_path = temp_file.name
+def _drain(stream, chunks):
+    chunks.append(stream.read())
 
-    mojo_cmd = (
-        f"mojo -I . -I decimojo/src -I keccak "
-        f"tests/test_wycheproof_verify.mojo {temp_file_path}"
+def run_mojo_verifier(batches):
+    """
+    Streams every test in `batches` through one long-lived Mojo verifier
+    process, checks each verdict as soon as the verifier prints it, and
+    returns the number of failures.
+
+    Each batch shares one public key, sent once as a `PUBKEY` line so the
+    verifier parses and validates it once rather than for every row. r and
+    s are zero-padded to 64 hex digits so the verifier can read them as
+    fixed-width words.
+    """
+    payload = b"".join(
+        b"PUBKEY %s\n" % pub_hex
+        + b"".join(
+            b"%s\t%064x\t%064x\n" % (msg_hex, r, s)
+            for msg_hex, r, s, _, _ in batch
+        )
+        for pub_hex, batch in batches
     )
+    tests = [test for _, batch in batches for test in batch]
+
     process = subprocess.Popen(
-        mojo_cmd,
-        shell=True,
+        MOJO_VERIFY_CMD,
+        stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        executable="/bin/bash"
     )
-    stdout, stderr = process.communicate()
-    if process.returncode != 0:
+    # stdin is fed and stderr drained on their own threads so neither pipe
+    # can fill up and stall the verifier while its stdout is read here
+    stderr_chunks = []
+    pumps = [
+        threading.Thread(target=_feed, args=(process.stdin, payload)),
+        threading.Thread(target=_drain, args=(process.stderr, stderr_chunks)),
+    ]
+    for pump in pumps:
+        pump.start()
+
+    fails = 0
+    checked = 0
+    for line in process.stdout:
+        if checked < len(tests):
+            fails += check_result(tests[checked], line.rstrip().decode())
+            checked += 1
+
+    for pump in pumps:
+        pump.join()
+    if process.wait() != 0:
         print("Mojo script failed:", file=sys.stderr)
-        print(stderr.decode(), file=sys.stderr)
-        return ["fail"] * len(batch)
+        print(b"".join(stderr_chunks).decode(), file=sys.stderr)
+
+    # A crash or short output leaves tests without a verdict; count them
+    for test in tests[checked:]:
+        fails += check_result(test, "fail")
+    return fails
 
-    return stdout.decode().strip().split('\n')
+def check_result(test, actual):
+    """
+    Compares one Mojo verdict against the expected Wycheproof result and
+    returns 1 if it failed, 0 otherwise.
+    """
+    tcId = test[3]
+    expected = test[4]
+    if (expected, actual) not in ALLOWED:
+        print(f"FAIL: tcId={str(tcId)}, expected={expected}, actual={actual}", file=sys.stderr)
+        return 1
+    return 0
 
 def main():
     # Determine the absolute path to the test vectors file
@@ -45,51 +157,43 @@ def main():
     repo_root = os.path.abspath(os.path.join(script_dir, '..'))
     file_path = os.path.join(repo_root, "external/wycheproof/testvectors_v1/ecdsa_secp256k1_sha256_test.json")
 
-    with open(file_path) as f:
-        data = json.load(f)
-
     fails = 0
     total = 0
-    batch = []
+    batches = []
     batch_size = 100
 
-    for test_group in data["testGroups"]:
-        pub_key = binascii.unhexlify(test_group["publicKey"]["uncompressed"])
-        for test in test_group["tests"]:
-            total += 1
-            msg = binascii.unhexlify(test["msg"])
-            sig = binascii.unhexlify(test["sig"])
-            try:
-                r, s = sigdecode_der(sig, SECP256k1.order)
-            except:
-                r, s = 0, 0 # Invalid signature
-
-            batch.append((pub_key, msg, r, s, test["tcId"], test["result"]))
-
-            if len(batch) >= batch_size:
-                results = run_mojo_verifier_batch([(b[0], b[1], b[2], b[3]) for b in batch])
-                for i, actual in enumerate(results):
-                    tcId = batch[i][4]
-                    expected = batch[i][5]
-                    if actual != expected:
-                        if expected == "acceptable" and actual == "valid":
-                            pass
-                        else:
-                            print(f"FAIL: tcId={str(tcId)}, expected={expected}, actual={actual}", file=sys.stderr)
-                            fails += 1
-                batch = []
-
-    if batch:
-        results = run_mojo_verifier_batch([(b[0], b[1], b[2], b[3]) for b in batch])
-        for i, actual in enumerate(results):
-            tcId = batch[i][4]
-            expected = batch[i][5]
-            if actual != expected:
-                if expected == "acceptable" and actual == "valid":
-                    pass
-                else:
-                    print(f"FAIL: tcId={str(tcId)}, expected={expected}, actual={actual}", file=sys.stderr)
-                    fails += 1
+    # Chunk every test up front so the batches can be verified concurrently.
+    # Batches never span groups, so each carries a single public key. The
+    # file is streamed one group at a time rather than loaded whole.
+    with open(file_path, "rb") as f:
+        for test_group in ijson.items(f, "testGroups.item"):
+            # Key and message are already hex in the file, so they are
+            # forwarded as-is instead of being decoded and re-encoded
+            pub_hex = test_group["publicKey"]["uncompressed"].encode()
+            batch = []
+            for test in test_group["tests"]:
+                total += 1
+                sig = binascii.unhexlify(test["sig"])
+                r, s = _parse_der(sig)
+
+                batch.append((test["msg"].encode(), r, s, test["tcId"], test["result"]))
+
+                if len(batch) >= batch_size:
+                    batches.append((pub_hex, batch))
+                    batch = []
+
+            if batch:
+                batches.append((pub_hex, batch))
+
+    # One long-lived Mojo process per worker pays the Mojo start-up cost once
+    # per core instead of once per batch. The workers only wait on their
+    # child process, so threads are enough to keep every core busy.
+    workers = max(1, min(os.cpu_count() or 1, len(batches)))
+    shards = [batches[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_mojo_verifier, shard) for shard in shards]
+        for future in as_completed(futures):
+            fails += future.result()
 
     if fails > 0:
         print(f"FAIL: {fails} of {total} Wycheproof tests failed.", file=sys.stderr)
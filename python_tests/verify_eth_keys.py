@@ -1,40 +1,55 @@
 #!/usr/bin/env python3
-import sys, csv, io, binascii
+import sys, csv, io, functools
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from eth_keys.datatypes import PrivateKey, Signature
 
 def h2b(h: str) -> bytes:
-    h = h[2:] if h.startswith(("0x","0X")) else h
-    return binascii.unhexlify(h.encode())
+    return bytes.fromhex(h[2:] if h[:2] in ("0x", "0X") else h)
 
 def v_to_01(v: int) -> int:
     # Mojo outputs v in {27..30}; keep only parity bit
-    return (v - 27) & 1 if v >= 27 else (v & 1)
+    # (v - 27) & 1 flips the low bit because 27 is odd, so xor it instead
+    return (v ^ (v >= 27)) & 1
 
-def verify_row(row):
-    sk = h2b(row["sk_hex"])
-    msg32 = h2b(row["msg32_hex"])
-    r = int(row["r_hex"], 16)
-    s = int(row["s_hex"], 16)
-    v01 = v_to_01(int(row["v"]))
+@functools.lru_cache(maxsize=4096)
+def _pub_from_sk(sk: bytes):
+    # Deriving the public key is a full scalar multiplication, and the
+    # same key usually signs many rows
+    return PrivateKey(sk).public_key
 
-    priv = PrivateKey(sk)
-    pub = priv.public_key
+# Columns verify_row needs, in the order it unpacks them
+FIELDS = ("sk_hex", "msg32_hex", "r_hex", "s_hex", "v")
+
+def verify_row(fields):
+    sk_hex, msg32_hex, r_hex, s_hex, v = fields
+    sk = h2b(sk_hex)
+    msg32 = h2b(msg32_hex)
+    r = int(r_hex, 16)
+    s = int(s_hex, 16)
+    v01 = v_to_01(int(v))
+
+    pub = _pub_from_sk(sk)
     sig = Signature(vrs=(v01, r, s))
     return sig.verify_msg_hash(msg32, pub)
 
 def main():
     data = sys.stdin.read()
-    rdr = csv.DictReader(io.StringIO(data), delimiter="\t")
-    fails, total = [], 0
-    for row in rdr:
-        total += 1
-        if not verify_row(row):
-            fails.append(row)
+    rdr = csv.reader(io.StringIO(data), delimiter="\t")
+    header = next(rdr)
+    col = {name: header.index(name) for name in ("idx",) + FIELDS}
+    get = itemgetter(*(col[name] for name in FIELDS))
+    rows = [row for row in rdr if row]
+    total = len(rows)
+    # Each verify is pure CPU work, so spread the rows across processes
+    with ProcessPoolExecutor() as ex:
+        results = list(ex.map(verify_row, map(get, rows), chunksize=64))
+    fails = [row for row, ok in zip(rows, results) if not ok]
     if fails:
         print(f"FAILURES DETECTED: {len(fails)}", file=sys.stderr)
         for r in fails:
-            print(f"idx={r['idx']} sk={r['sk_hex']} msg32={r['msg32_hex']}", file=sys.stderr)
-            print(f"  r={r['r_hex']} s={r['s_hex']} v={r['v']}", file=sys.stderr)
+            print(f"idx={r[col['idx']]} sk={r[col['sk_hex']]} msg32={r[col['msg32_hex']]}", file=sys.stderr)
+            print(f"  r={r[col['r_hex']]} s={r[col['s_hex']]} v={r[col['v']]}", file=sys.stderr)
         sys.exit(1)
     print(f"PASS: {total} signatures verified against eth-keys")
     sys.exit(0)
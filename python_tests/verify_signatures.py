@@ -1,51 +1,13 @@
 #!/usr/bin/env python3
-from eth_keys import keys
-from eth_keys.datatypes import PrivateKey, Signature
-from typing import Tuple
+import functools
+from coincurve.ecdsa import cdata_to_der, deserialize_compact
+from coincurve.keys import PrivateKey, PublicKey
 
-def verify_signature(msg_hash: bytes, signature: Tuple[bytes, bytes, int], pubkey: keys.PublicKey) -> bool:
-    """Verify a secp256k1 signature using eth-keys."""
-    try:
-        r, s, v = signature
-        # Create signature object from r, s, v components
-        sig_obj = Signature(vrs=(v, int.from_bytes(r, 'big'), int.from_bytes(s, 'big')))
-        return sig_obj.verify_msg_hash(msg_hash, pubkey)
-    except Exception as e:
-        print(f"Verification error: {e}")
-        return False
+CURVE_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 
-def hex_to_bytes(hex_str: str) -> bytes:
-    """Convert hex string to bytes, stripping '0x' if present."""
-    if hex_str.startswith('0x'):
-        hex_str = hex_str[2:]
-    return bytes.fromhex(hex_str)
-
-def init_verifier():
-    """Initialize the verifier singleton - call once at start."""
-    return True
-
-def verify_test_vector(msg_hash: bytes, r: bytes, s: bytes, v: int, privkey: bytes) -> bool:
-    """
-    Verify a single test vector against reference implementation.
-    Returns True if signature is valid.
-    """
-    try:
-        # Create private key from bytes
-        private_key = PrivateKey(privkey)
-        public_key = private_key.public_key
-        
-        # Create signature object
-        sig_obj = Signature(vrs=(
-            v,
-            int.from_bytes(r, 'big'),
-            int.from_bytes(s, 'big')
-        ))
-        
-        # Verify the signature
-        return sig_obj.verify_msg_hash(msg_hash, public_key)
-    except Exception as e:
-        print(f"Test vector verification error: {e}")
-        return False
+@functools.lru_cache(maxsize=4096)
+def _pub_from_sk(privkey: bytes) -> PublicKey:
+    return PrivateKey(privkey).public_key
 
 # The interface that Mojo will use
 def verify_mojo_signature(
@@ -58,14 +20,19 @@ def verify_mojo_signature(
     """
     Verify a signature produced by Mojo implementation.
     All inputs are hex strings (without 0x prefix) except v which is an integer.
+    v must be a 0/1 recovery id, as eth-keys required.
     """
+    if v not in (0, 1):
+        return False
     try:
-        msg_hash = hex_to_bytes(msg_hash_hex)
-        r = hex_to_bytes(r_hex)
-        s = hex_to_bytes(s_hex)
-        privkey = hex_to_bytes(privkey_hex)
-        
-        return verify_test_vector(msg_hash, r, s, v, privkey)
+        r = int(r_hex, 16)
+        s = int(s_hex, 16)
+        # libsecp256k1 rejects high-s signatures, so fold s into the lower half
+        if s > CURVE_N // 2:
+            s = CURVE_N - s
+        signature = cdata_to_der(deserialize_compact(r.to_bytes(32, 'big') + s.to_bytes(32, 'big')))
+        public_key = _pub_from_sk(bytes.fromhex(privkey_hex.removeprefix('0x')))
+        return public_key.verify(signature, bytes.fromhex(msg_hash_hex.removeprefix('0x')), hasher=None)
     except Exception as e:
         print(f"Mojo signature verification error: {e}")
-        return False
\ No newline at end of file
+        return False